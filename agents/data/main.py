@@ -7,10 +7,13 @@ lists, and encounter history via A2A.
 """
 
 import os
-from typing import Any, Dict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
 
 import httpx
+import orjson
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from sdk.types import (
     AgentCard,
@@ -30,25 +33,40 @@ from shared.message_utils import build_text_message
 MCP_ENDPOINT = os.getenv("MCP_SERVER_URL", "http://localhost:8000")
 
 
-async def invoke_mcp(tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+def create_mcp_client() -> httpx.AsyncClient:
+    """
+    Build the pooled client shared by every MCP call made by this agent.
+    Keep-alive connections are reused so each tool call skips the TCP
+    handshake.
+    """
+    return httpx.AsyncClient(
+        base_url=MCP_ENDPOINT,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=httpx.Timeout(10.0, connect=3.0),
+    )
+
+
+async def invoke_mcp(
+    client: httpx.AsyncClient, tool_name: str, args: Dict[str, Any]
+) -> Dict[str, Any]:
     """
     Forward a tool call to the MCP server and return its result portion.
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{MCP_ENDPOINT}/tools/call",
-            json={"name": tool_name, "arguments": args},
-        )
-        response.raise_for_status()
-        body = response.json()
-        return body.get("result", {})
+    response = await client.post(
+        "/tools/call",
+        json={"name": tool_name, "arguments": args},
+    )
+    response.raise_for_status()
+    body = orjson.loads(response.content)
+    return body.get("result", {})
 
 
 # ---------------------------------------------------------------------------
 # Skill implementation
 # ---------------------------------------------------------------------------
 
-async def handle_data_request(message: Message) -> Message:
+async def handle_data_request(message: Message, client: httpx.AsyncClient) -> Message:
     """
     Interpret the incoming text query and choose the correct MCP tool.
     """
@@ -57,15 +75,15 @@ async def handle_data_request(message: Message) -> Message:
 
     # simple rule-based routing for demo purposes
     if "list" in lowered:
-        data = await invoke_mcp("list_patients", {"limit": 5})
+        data = await invoke_mcp(client, "list_patients", {"limit": 5})
         reply = f"Patient list (limit 5): {data}"
 
     elif "history" in lowered:
-        data = await invoke_mcp("get_patient_history", {"patient_id": 1})
+        data = await invoke_mcp(client, "get_patient_history", {"patient_id": 1})
         reply = f"Encounter history for patient 1: {data}"
 
     else:
-        data = await invoke_mcp("get_patient", {"patient_id": 1})
+        data = await invoke_mcp(client, "get_patient", {"patient_id": 1})
         reply = f"Patient record: {data}"
 
     return build_text_message(reply)
@@ -112,11 +130,24 @@ def build_agent_card() -> AgentCard:
 # FastAPI application factory
 # ---------------------------------------------------------------------------
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    app.state.mcp_client = create_mcp_client()
+    try:
+        yield
+    finally:
+        await app.state.mcp_client.aclose()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="Patient Data Agent Service")
+    app = FastAPI(
+        title="Patient Data Agent Service",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
     handler = SimpleAgentRequestHandler(
         agent_id="patient-data",
-        skill_callback=handle_data_request,
+        skill_callback=lambda message: handle_data_request(message, app.state.mcp_client),
     )
     register_agent_routes(app, build_agent_card(), handler)
     return app
@@ -128,4 +159,12 @@ app = create_app()
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8011)
+    uvicorn.run(
+        "agents.data.main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", 8011)),
+        workers=int(os.getenv("WORKERS", 1)),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+    )
@@ -6,7 +6,10 @@ This agent does not call MCP tools directly; instead, it provides domain-
 specific responses to upstream agents such as the router.
 """
 
+import os
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from sdk.types import (
     AgentCard,
@@ -74,7 +77,7 @@ def create_agent_card() -> AgentCard:
 # ---------------------------------------------------------------------------
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Insurance Agent Service")
+    app = FastAPI(title="Insurance Agent Service", default_response_class=ORJSONResponse)
     handler = SimpleAgentRequestHandler(
         agent_id="insurance",
         skill_callback=insurance_skill,
@@ -89,4 +92,12 @@ app = create_app()
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8013)
+    uvicorn.run(
+        "agents.payments.main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", 8013)),
+        workers=int(os.getenv("WORKERS", 1)),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+    )
@@ -1,16 +1,24 @@
 """
 Router Agent
 ------------
-Coordinates between specialist A2A agents (data, triage, insurance) using a
-LangGraph workflow. The router interprets user intent, forwards the request to
-the appropriate agent(s), and aggregates the returned information.
+Coordinates between specialist A2A agents (data, triage, insurance). The router
+interprets user intent, forwards the request to the appropriate agent(s), and
+aggregates the returned information. The same steps can optionally run as a
+LangGraph workflow (ROUTER_USE_LANGGRAPH=1).
 """
 
+import asyncio
+import hashlib
 import os
-from typing import List, TypedDict
+import re
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Pattern, Tuple, TypedDict
 
 import httpx
+import orjson
+from cachetools import TTLCache
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from langgraph.graph import StateGraph, END
 
 from sdk.types import (
@@ -19,12 +27,9 @@ from sdk.types import (
     AgentProvider,
     AgentSkill,
     Message,
-    MessageSendParams,
-    Role,
-    Task,
 )
 from shared.a2a_handler import SimpleAgentRequestHandler, register_agent_routes
-from shared.message_utils import build_text_message
+from shared.message_utils import build_text_message, new_id
 
 
 # ---------------------------------------------------------------------------
@@ -35,6 +40,45 @@ DATA_RPC = os.getenv("DATA_AGENT_RPC", "http://localhost:8011/rpc")
 TRIAGE_RPC = os.getenv("TRIAGE_AGENT_RPC", "http://localhost:8012/rpc")
 INSURANCE_RPC = os.getenv("INSURANCE_AGENT_RPC", "http://localhost:8013/rpc")
 
+AGENT_RPC_URLS: Dict[str, str] = {
+    "data": DATA_RPC,
+    "triage": TRIAGE_RPC,
+    "insurance": INSURANCE_RPC,
+}
+
+
+def create_rpc_clients() -> Dict[str, httpx.AsyncClient]:
+    """
+    Build one pooled client per specialist agent so keep-alive connections
+    are reused across router requests. HTTP/2 is negotiated when the agent
+    sits behind a TLS endpoint that offers it; otherwise HTTP/1.1 is used.
+    """
+    return {
+        agent_key: httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=httpx.Timeout(30.0, connect=3.0),
+        )
+        for agent_key in AGENT_RPC_URLS
+    }
+
+
+# Specialists queried for each route: the first entry lists agents that only
+# need the user's text and can be called concurrently; the second names an
+# agent whose prompt depends on those replies (or None).
+ROUTE_PLANS: Dict[str, Tuple[Tuple[str, ...], Optional[str]]] = {
+    "data_then_triage": (("data",), "triage"),
+    "insurance": (("insurance",), None),
+    "triage": (("triage",), None),
+}
+
+# Intent keywords compiled once, checked in priority order; anything that
+# matches none of them falls back to the triage route.
+INTENT_PATTERNS: Tuple[Tuple[str, Pattern[str]], ...] = (
+    ("insurance", re.compile("insurance|coverage|billing|copay")),
+    ("data_then_triage", re.compile("patient|history|chart")),
+)
+
 
 # ---------------------------------------------------------------------------
 # Router state model for LangGraph
@@ -50,93 +94,155 @@ class RouterState(TypedDict):
 # Utility: Send a JSON-RPC message to any A2A agent
 # ---------------------------------------------------------------------------
 
-async def call_agent_over_rpc(agent_url: str, text: str) -> str:
+def build_send_request(text: str) -> Dict[str, Any]:
     """
-    Send a single text message to an A2A agent via JSON-RPC and extract the reply.
+    Build a JSON-RPC message/send call carrying a single user text message.
     """
-    msg_id = os.urandom(8).hex()
-    payload = {
+    return {
         "jsonrpc": "2.0",
-        "id": msg_id,
+        "id": new_id(),
         "method": "message/send",
-        "params": MessageSendParams(
-            message=Message(
-                messageId=os.urandom(8).hex(),
-                role=Role.user,
-                parts=[build_text_message(text, role=Role.user).parts[0]],
-            )
-        ).model_dump(),
+        "params": {
+            "message": {
+                "messageId": new_id(),
+                "role": "user",
+                "parts": [{"text": text}],
+                "taskId": None,
+                "contextId": None,
+            }
+        },
     }
 
-    async with httpx.AsyncClient() as client:
-        r = await client.post(agent_url, json=payload)
-        r.raise_for_status()
-        response_body = r.json()
 
+def extract_reply(response_body: Dict[str, Any]) -> str:
+    """
+    Pull the agent's reply text out of a JSON-RPC response envelope.
+    """
     if "result" not in response_body:
         return ""
 
-    task = Task.model_validate(response_body["result"])
-    if task.history and len(task.history) > 1:
-        latest = task.history[-1]
-        if latest.parts:
-            return latest.parts[0].text
+    # Both ends of this link are our own agents, so read the Task payload as
+    # plain JSON instead of re-validating it into Pydantic models.
+    history = response_body["result"].get("history") or []
+    if len(history) > 1:
+        parts = history[-1].get("parts") or []
+        if parts:
+            return parts[0].get("text", "")
 
     return ""
 
 
+async def call_agent_over_rpc(
+    clients: Dict[str, httpx.AsyncClient], agent_key: str, text: str
+) -> str:
+    """
+    Send a single text message to an A2A agent via JSON-RPC and extract the reply.
+    """
+    r = await clients[agent_key].post(AGENT_RPC_URLS[agent_key], json=build_send_request(text))
+    r.raise_for_status()
+    return extract_reply(orjson.loads(r.content))
+
+
+async def call_agents_batch(
+    clients: Dict[str, httpx.AsyncClient], agent_key: str, texts: List[str]
+) -> List[str]:
+    """
+    Send several text messages to one A2A agent as a single JSON-RPC batch and
+    return the replies in the same order as ``texts``.
+    """
+    if not texts:
+        return []
+
+    payload = [build_send_request(text) for text in texts]
+    r = await clients[agent_key].post(AGENT_RPC_URLS[agent_key], json=payload)
+    r.raise_for_status()
+
+    # batch responses may come back in any order, so match them up by id
+    by_id = {item.get("id"): item for item in orjson.loads(r.content)}
+    return [extract_reply(by_id.get(call["id"], {})) for call in payload]
+
+
 # ---------------------------------------------------------------------------
-# LangGraph workflow definition
+# Routing steps: classify -> dispatch -> summarize
 # ---------------------------------------------------------------------------
 
-def create_router_graph():
-    graph = StateGraph(RouterState)
+def classify_intent(text: str) -> str:
+    """
+    Pick a route for the user's text based on intent keywords.
+    """
+    query = text.lower()
+    return next(
+        (route for route, pattern in INTENT_PATTERNS if pattern.search(query)),
+        "triage",
+    )
 
-    # ---- Classification step ------------------------------------------------
-    def classify_intent(state: RouterState) -> RouterState:
-        query = state["messages"][-1].lower()
 
-        if any(word in query for word in ["insurance", "coverage", "billing", "copay"]):
-            state["route"] = "insurance"
-        elif any(word in query for word in ["patient", "history", "chart"]):
-            state["route"] = "data_then_triage"
-        else:
-            state["route"] = "triage"
+async def run_specialists(
+    clients: Dict[str, httpx.AsyncClient], route: str, user_text: str
+) -> List[str]:
+    """
+    Call the specialists for a route and collect their replies in order.
+    """
+    independent, dependent = ROUTE_PLANS.get(route, ROUTE_PLANS["triage"])
 
-        return state
+    # fan out to every specialist that only needs the raw user text
+    collected: List[str] = list(
+        await asyncio.gather(
+            *(call_agent_over_rpc(clients, agent_key, user_text) for agent_key in independent)
+        )
+    )
+
+    # a dependent specialist must wait for the context gathered above
+    if dependent:
+        context = " ".join(collected)
+        combined_prompt = f"Data context: {context}. Provide guidance to the user."
+        collected.append(await call_agent_over_rpc(clients, dependent, combined_prompt))
+
+    return collected
 
-    # ---- Specialist handoff -------------------------------------------------
-    async def run_specialists(state: RouterState) -> RouterState:
-        user_text = state["messages"][-1]
-        collected: List[str] = []
 
-        if state["route"] == "data_then_triage":
-            data_reply = await call_agent_over_rpc(DATA_RPC, user_text)
-            combined_prompt = f"Data context: {data_reply}. Provide guidance to the user."
-            triage_reply = await call_agent_over_rpc(TRIAGE_RPC, combined_prompt)
-            collected.extend([data_reply, triage_reply])
+def summarize_outputs(results: List[str]) -> str:
+    """
+    Merge specialist replies into the router's final answer.
+    """
+    text = "\n".join(results)
+    return f"Router summary:\n{text}"
 
-        elif state["route"] == "insurance":
-            insurance_reply = await call_agent_over_rpc(INSURANCE_RPC, user_text)
-            collected.append(insurance_reply)
 
-        else:  # fallback to triage
-            triage_reply = await call_agent_over_rpc(TRIAGE_RPC, user_text)
-            collected.append(triage_reply)
+# ---------------------------------------------------------------------------
+# LangGraph workflow definition
+# ---------------------------------------------------------------------------
+
+# The three steps above run as plain function calls by default. The graph
+# only pays off once checkpointing, conditional edges, or human-in-the-loop
+# pauses are needed, so it is opt-in.
+USE_LANGGRAPH = os.getenv("ROUTER_USE_LANGGRAPH", "false").lower() in {"1", "true", "yes"}
 
-        state["results"] = collected
+
+def create_router_graph(app: FastAPI):
+    graph = StateGraph(RouterState)
+
+    # ---- Classification step ------------------------------------------------
+    def classify_node(state: RouterState) -> RouterState:
+        state["route"] = classify_intent(state["messages"][-1])
+        return state
+
+    # ---- Specialist handoff -------------------------------------------------
+    async def dispatch_node(state: RouterState) -> RouterState:
+        state["results"] = await run_specialists(
+            app.state.rpc_clients, state["route"], state["messages"][-1]
+        )
         return state
 
     # ---- Summary generation -------------------------------------------------
-    def summarize_outputs(state: RouterState) -> RouterState:
-        text = "\n".join(state.get("results", []))
-        state["messages"].append(f"Router summary:\n{text}")
+    def summarize_node(state: RouterState) -> RouterState:
+        state["messages"].append(summarize_outputs(state.get("results", [])))
         return state
 
     # assemble graph
-    graph.add_node("classify", classify_intent)
-    graph.add_node("dispatch", run_specialists)
-    graph.add_node("summarize", summarize_outputs)
+    graph.add_node("classify", classify_node)
+    graph.add_node("dispatch", dispatch_node)
+    graph.add_node("summarize", summarize_node)
 
     graph.set_entry_point("classify")
     graph.add_edge("classify", "dispatch")
@@ -146,23 +252,62 @@ def create_router_graph():
     return graph.compile()
 
 
-workflow = create_router_graph()
-
-
 # ---------------------------------------------------------------------------
 # Skill executed when router receives a message
 # ---------------------------------------------------------------------------
 
-async def router_skill(message: Message) -> Message:
-    initial_text = message.parts[0].text if (message.parts and message.parts[0].text) else ""
-    starting_state: RouterState = {
-        "messages": [initial_text],
-        "route": "triage",
-        "results": [],
+# Recent summaries keyed by a hash of the normalized prompt, so repeated
+# questions skip the specialist fan-out until the entry expires. Cache access
+# never awaits, so no lock is needed on the event loop.
+REPLY_CACHE_TTL = float(os.getenv("ROUTER_CACHE_TTL", 30))
+_reply_cache: TTLCache = TTLCache(
+    maxsize=int(os.getenv("ROUTER_CACHE_SIZE", 256)), ttl=REPLY_CACHE_TTL
+)
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _cache_key(text: str) -> bytes:
+    normalized = " ".join(text.lower().split())
+    return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+
+def reply_cache_stats() -> Dict[str, Any]:
+    """
+    Report reply-cache usage for the health endpoint.
+    """
+    return {
+        "reply_cache": {
+            **_cache_stats,
+            "size": len(_reply_cache),
+            "ttl_seconds": REPLY_CACHE_TTL,
+        }
     }
 
-    final = await workflow.ainvoke(starting_state)
-    summary = final["messages"][-1]
+
+async def router_skill(message: Message, app: FastAPI, workflow=None) -> Message:
+    initial_text = message.parts[0].text if (message.parts and message.parts[0].text) else ""
+
+    key = _cache_key(initial_text)
+    summary = _reply_cache.get(key)
+    if summary is not None:
+        _cache_stats["hits"] += 1
+        return build_text_message(summary)
+    _cache_stats["misses"] += 1
+
+    if workflow is None:
+        route = classify_intent(initial_text)
+        results = await run_specialists(app.state.rpc_clients, route, initial_text)
+        summary = summarize_outputs(results)
+    else:
+        starting_state: RouterState = {
+            "messages": [initial_text],
+            "route": "triage",
+            "results": [],
+        }
+        final = await workflow.ainvoke(starting_state)
+        summary = final["messages"][-1]
+
+    _reply_cache[key] = summary
     return build_text_message(summary)
 
 
@@ -207,13 +352,30 @@ def create_agent_card() -> AgentCard:
 # FastAPI application factory
 # ---------------------------------------------------------------------------
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    app.state.rpc_clients = create_rpc_clients()
+    try:
+        yield
+    finally:
+        for client in app.state.rpc_clients.values():
+            await client.aclose()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="Router Agent Service")
+    app = FastAPI(
+        title="Router Agent Service",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
+    workflow = create_router_graph(app) if USE_LANGGRAPH else None
     handler = SimpleAgentRequestHandler(
         agent_id="router",
-        skill_callback=router_skill,
+        skill_callback=lambda message: router_skill(message, app, workflow),
+    )
+    register_agent_routes(
+        app, create_agent_card(), handler, health_details=reply_cache_stats
     )
-    register_agent_routes(app, create_agent_card(), handler)
     return app
 
 
@@ -223,4 +385,12 @@ app = create_app()
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8010)
+    uvicorn.run(
+        "agents.router.main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", 8010)),
+        workers=int(os.getenv("WORKERS", 1)),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+    )
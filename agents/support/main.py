@@ -8,7 +8,11 @@ incorporates it into a more informed response.
 
 from __future__ import annotations
 
+import os
+import re
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from sdk.types import (
     AgentCard,
@@ -21,6 +25,68 @@ from shared.a2a_handler import SimpleAgentRequestHandler, register_agent_routes
 from shared.message_utils import build_text_message
 
 
+# ---------------------------------------------------------------------------
+# Keyword tables
+# ---------------------------------------------------------------------------
+
+# Every keyword sets one category bit, so a single regex pass over the prompt
+# yields a bitmap of all categories present. Lower bits take priority.
+_CHEST = 1 << 0
+_FAINTING = 1 << 1
+_RESPIRATORY = 1 << 2
+_MEDICATION = 1 << 3
+_FOLLOW_UP = 1 << 4
+
+_KEYWORD_BITS: dict[str, int] = {
+    "chest pain": _CHEST,
+    "shortness of breath": _CHEST,
+    "fainting": _FAINTING,
+    "fever": _RESPIRATORY,
+    "cough": _RESPIRATORY,
+    "sore throat": _RESPIRATORY,
+    "medication": _MEDICATION,
+    "refill": _MEDICATION,
+    "prescription": _MEDICATION,
+    "history": _FOLLOW_UP,
+    "follow": _FOLLOW_UP,
+    "activity": _FOLLOW_UP,
+}
+
+_KEYWORD_SCANNER = re.compile("|".join(map(re.escape, _KEYWORD_BITS)))
+
+_SUGGESTIONS: dict[str, tuple[str, ...]] = {
+    "emergency": (
+        "If symptoms are severe or worsening, call emergency services immediately.",
+        "Do not drive yourself; ask someone to help or call for transport.",
+    ),
+    "respiratory": (
+        "Track your temperature, stay hydrated, and rest.",
+        "If fever persists beyond 48 hours or you have breathing issues, seek urgent care.",
+    ),
+    "medication": (
+        "I can log a refill request and confirm the pharmacy details.",
+        "Please share the medication name, dose, and preferred pharmacy.",
+    ),
+    "follow_up": (
+        "I reviewed your recent encounters and will flag any changes for the clinician.",
+        "Let me know if your symptoms changed since the last check-in.",
+    ),
+    "default": (
+        "Share your symptoms, when they started, and any current medications.",
+        "We can arrange a follow-up or connect you to a clinician if needed.",
+    ),
+}
+
+# Highest-priority category bit -> suggestion set.
+_SUGGESTIONS_BY_BIT: dict[int, tuple[str, ...]] = {
+    _CHEST: _SUGGESTIONS["emergency"],
+    _FAINTING: _SUGGESTIONS["emergency"],
+    _RESPIRATORY: _SUGGESTIONS["respiratory"],
+    _MEDICATION: _SUGGESTIONS["medication"],
+    _FOLLOW_UP: _SUGGESTIONS["follow_up"],
+}
+
+
 # ---------------------------------------------------------------------------
 # Internal helper functions
 # ---------------------------------------------------------------------------
@@ -44,28 +110,25 @@ def parse_triage_prompt(text: str) -> tuple[str, str]:
     return "", cleaned or "your request"
 
 
-def generate_suggestions(user_prompt: str) -> list[str]:
+def keyword_mask(lower: str) -> int:
+    """
+    Scan a lowercased prompt once and return the bitmap of keyword categories.
+    """
+    mask = 0
+    for match in _KEYWORD_SCANNER.finditer(lower):
+        mask |= _KEYWORD_BITS[match.group()]
+    return mask
+
+
+def generate_suggestions(user_prompt: str, *, mask: int | None = None) -> list[str]:
     """
     Produce 2–3 practical next steps based on keywords in the request.
+    Callers that already scanned the prompt can pass its keyword ``mask``.
     """
-    lower = user_prompt.lower()
-    out: list[str] = []
-
-    if any(k in lower for k in ["chest pain", "shortness of breath", "fainting"]):
-        out.append("If symptoms are severe or worsening, call emergency services immediately.")
-        out.append("Do not drive yourself; ask someone to help or call for transport.")
-    elif any(k in lower for k in ["fever", "cough", "sore throat"]):
-        out.append("Track your temperature, stay hydrated, and rest.")
-        out.append("If fever persists beyond 48 hours or you have breathing issues, seek urgent care.")
-    elif any(k in lower for k in ["medication", "refill", "prescription"]):
-        out.append("I can log a refill request and confirm the pharmacy details.")
-        out.append("Please share the medication name, dose, and preferred pharmacy.")
-    elif any(k in lower for k in ["history", "follow", "activity"]):
-        out.append("I reviewed your recent encounters and will flag any changes for the clinician.")
-        out.append("Let me know if your symptoms changed since the last check-in.")
-    else:
-        out.append("Share your symptoms, when they started, and any current medications.")
-        out.append("We can arrange a follow-up or connect you to a clinician if needed.")
+    if mask is None:
+        mask = keyword_mask(user_prompt.lower())
+    # mask & -mask isolates the lowest set bit, i.e. the top-priority category
+    out: list[str] = list(_SUGGESTIONS_BY_BIT.get(mask & -mask, _SUGGESTIONS["default"]))
 
     out.append("If this is urgent, reply here and I’ll prioritize your case.")
     return out
@@ -82,6 +145,8 @@ async def triage_skill(message: Message) -> Message:
     """
     text = message.parts[0].text if (message.parts and message.parts[0].text) else ""
     context_text, request_text = parse_triage_prompt(text)
+    # one scan of the prompt feeds both the context line and the suggestions
+    mask = keyword_mask(text.lower())
 
     # Greeting
     if context_text:
@@ -90,10 +155,9 @@ async def triage_skill(message: Message) -> Message:
         opening = "Hi there, thanks for reaching out."
 
     # Small contextual line
-    prompt_lower = text.lower()
-    if any(k in prompt_lower for k in ["chest pain", "shortness of breath"]):
+    if mask & _CHEST:
         context_line = "Chest symptoms can be serious, so I want to make sure you're safe."
-    elif any(k in prompt_lower for k in ["fever", "cough", "sore throat"]):
+    elif mask & _RESPIRATORY:
         context_line = "Respiratory symptoms can vary, so I’ll ask a few key questions."
     elif context_text:
         context_line = "I’ve reviewed the recent encounter notes you mentioned."
@@ -101,24 +165,22 @@ async def triage_skill(message: Message) -> Message:
         context_line = ""
 
     # Build suggestions
-    steps = generate_suggestions(text)
+    steps = generate_suggestions(text, mask=mask)
 
-    response_lines = [
-        opening,
-        context_line,
-        "",
-        f"Here’s what I recommend based on {request_text}:",
-    ]
+    # Only non-empty lines are added, so no filtering pass is needed
+    response_lines = [opening]
+    if context_line:
+        response_lines.append(context_line)
+    response_lines.append(f"Here’s what I recommend based on {request_text}:")
 
     # Include top 3 suggestions
-    for s in steps[:3]:
-        response_lines.append(f"- {s}")
+    response_lines.extend([f"- {s}" for s in steps[:3]])
 
     response_lines.append(
         "If you'd like me to take action now, just reply to this message and I’ll coordinate next steps."
     )
 
-    final_text = "\n".join(line for line in response_lines if line)
+    final_text = "\n".join(response_lines)
     return build_text_message(final_text)
 
 
@@ -164,7 +226,7 @@ def create_agent_card() -> AgentCard:
 # ---------------------------------------------------------------------------
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Triage Agent Service")
+    app = FastAPI(title="Triage Agent Service", default_response_class=ORJSONResponse)
     handler = SimpleAgentRequestHandler(
         agent_id="triage",
         skill_callback=triage_skill,
@@ -179,4 +241,12 @@ app = create_app()
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8012)
+    uvicorn.run(
+        "agents.support.main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", 8012)),
+        workers=int(os.getenv("WORKERS", 1)),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+    )
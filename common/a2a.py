@@ -4,7 +4,8 @@ A2A Runtime Utilities
 This module provides a minimal JSON-RPC execution layer for A2A agents.
 It defines:
 
-  - SimpleAgentRequestHandler: in-memory task + message management
+  - SimpleAgentRequestHandler: task + message management (in memory, or in
+    Redis when REDIS_URL is set so several workers can share tasks)
   - register_agent_routes: attaches JSON-RPC endpoints to a FastAPI app
 
 Every agent (router, data, triage, insurance) loads this file to expose
@@ -14,13 +15,15 @@ a standard RPC surface compliant with the A2A protocol used in Assignment 5.
 from __future__ import annotations
 
 import asyncio
-import json
-import uuid
-from typing import Any, AsyncGenerator, Dict, List, Optional
+import hashlib
+import os
+import secrets
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Union
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+import orjson
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from sdk.types import (
     AgentCard,
@@ -53,14 +56,28 @@ class RPCRequest(BaseModel):
     id: Optional[str | int] = None
 
 
+# Adapters are built once at import so each request goes straight to the
+# compiled validator for its params model.
+_MESSAGE_SEND_PARAMS = TypeAdapter(MessageSendParams)
+_TASK_QUERY_PARAMS = TypeAdapter(TaskQueryParams)
+_TASK_ID_PARAMS = TypeAdapter(TaskIdParams)
+_RPC_REQUEST = TypeAdapter(RPCRequest)
+
+
 # -----------------------------------------------------------------------------
-# Simple In-Memory Agent Runtime
+# Simple Agent Runtime
 # -----------------------------------------------------------------------------
 
+REDIS_URL = os.getenv("REDIS_URL")
+TASK_TTL_SECONDS = int(os.getenv("A2A_TASK_TTL", 3600))
+SKILL_CONCURRENCY = int(os.getenv("SKILL_CONCURRENCY", 64))
+
+
 class SimpleAgentRequestHandler:
     """
-    A minimal runtime for A2A agents. Maintains tasks in memory and
-    routes incoming RPC calls to the agent's skill callback.
+    A minimal runtime for A2A agents. Maintains tasks in memory (or in Redis
+    when REDIS_URL is configured) and routes incoming RPC calls to the
+    agent's skill callback.
     """
 
     def __init__(
@@ -69,30 +86,63 @@ class SimpleAgentRequestHandler:
         skill_callback=None,
         *,
         agent_id: str | None = None,
+        max_concurrency: int | None = None,
     ):
         if skill_callback is None:
             raise ValueError("skill_callback is required")
 
         self.agent_name = agent_name or agent_id or "agent"
         self._tasks: Dict[str, Task] = {}
+        self._redis = None
+        if REDIS_URL:
+            import redis.asyncio as redis_asyncio
+
+            self._redis = redis_asyncio.from_url(REDIS_URL)
         self._skill = skill_callback
+        # caps how many skill calls run at once in this worker
+        self._skill_slots = asyncio.Semaphore(max_concurrency or SKILL_CONCURRENCY)
 
     # -- internal --------------------------------------------------------------
 
     def _make_ids(self) -> tuple[str, str]:
-        """Create a (task_id, context_id) pair."""
-        return uuid.uuid4().hex, uuid.uuid4().hex
+        """
+        Create a (task_id, context_id) pair. These go back to clients and a
+        task id is the only credential for task/get, so they must be
+        unguessable; use the CSPRNG rather than message_utils.new_id.
+        """
+        return secrets.token_hex(16), secrets.token_hex(16)
+
+    def _task_key(self, task_id: str) -> str:
+        return f"task:{self.agent_name}:{task_id}"
+
+    async def _save_task(self, task: Task) -> None:
+        """Persist a task so any worker can serve task/get and task/cancel."""
+        if self._redis is None:
+            self._tasks[task.id] = task
+            return
+        await self._redis.set(
+            self._task_key(task.id),
+            orjson.dumps(task.model_dump()),
+            ex=TASK_TTL_SECONDS,
+        )
+
+    async def _load_task(self, task_id: str) -> Task | None:
+        if self._redis is None:
+            return self._tasks.get(task_id)
+        raw = await self._redis.get(self._task_key(task_id))
+        return Task.model_validate_json(raw) if raw else None
 
     # -- RPC method handlers ---------------------------------------------------
 
     async def on_get_task(self, params: TaskQueryParams) -> Task | None:
-        return self._tasks.get(params.id)
+        return await self._load_task(params.id)
 
     async def on_cancel_task(self, params: TaskIdParams) -> Task | None:
-        task = self._tasks.get(params.id)
+        task = await self._load_task(params.id)
         if not task:
             return None
-        task.status = TaskStatus(state=TaskState.canceled)
+        task.status = TaskStatus.model_construct(state=TaskState.canceled)
+        await self._save_task(task)
         return task
 
     async def on_message_send(self, params: MessageSendParams) -> Task:
@@ -105,16 +155,17 @@ class SimpleAgentRequestHandler:
         incoming.taskId = task_id
         incoming.contextId = ctx_id
 
-        reply = await self._skill(incoming)
+        async with self._skill_slots:
+            reply = await self._skill(incoming)
 
-        status = TaskStatus(state=TaskState.completed, message=reply)
-        task = Task(
+        status = TaskStatus.model_construct(state=TaskState.completed, message=reply)
+        task = Task.model_construct(
             id=task_id,
             contextId=ctx_id,
             history=[incoming, reply],
             status=status,
         )
-        self._tasks[task_id] = task
+        await self._save_task(task)
         return task
 
     async def on_message_send_stream(
@@ -130,26 +181,27 @@ class SimpleAgentRequestHandler:
         incoming.contextId = ctx_id
 
         # Yield "running" event
-        yield TaskStatusUpdateEvent(
+        yield TaskStatusUpdateEvent.model_construct(
             taskId=task_id,
             contextId=ctx_id,
-            status=TaskStatus(state=TaskState.running),
+            status=TaskStatus.model_construct(state=TaskState.running),
             final=False,
         )
 
-        reply = await self._skill(incoming)
+        async with self._skill_slots:
+            reply = await self._skill(incoming)
 
-        final_status = TaskStatus(state=TaskState.completed, message=reply)
-        task = Task(
+        final_status = TaskStatus.model_construct(state=TaskState.completed, message=reply)
+        task = Task.model_construct(
             id=task_id,
             contextId=ctx_id,
             history=[incoming, reply],
             status=final_status,
         )
-        self._tasks[task_id] = task
+        await self._save_task(task)
 
         # Yield "completed" event
-        yield TaskStatusUpdateEvent(
+        yield TaskStatusUpdateEvent.model_construct(
             taskId=task_id,
             contextId=ctx_id,
             status=final_status,
@@ -171,9 +223,9 @@ class SimpleAgentRequestHandler:
     async def on_resubscribe_to_task(
         self, params: TaskIdParams
     ) -> AsyncGenerator[Event, None]:
-        task = self._tasks.get(params.id)
+        task = await self._load_task(params.id)
         if task:
-            yield TaskStatusUpdateEvent(
+            yield TaskStatusUpdateEvent.model_construct(
                 taskId=task.id,
                 contextId=task.contextId,
                 status=task.status,
@@ -199,40 +251,50 @@ def register_agent_routes(
     app: FastAPI,
     agent_card: AgentCard,
     handler: SimpleAgentRequestHandler,
+    *,
+    health_details: Optional[Callable[[], Dict[str, Any]]] = None,
 ) -> None:
     """
     Register JSON-RPC endpoints + agent metadata routes for any A2A agent.
+
+    ``health_details`` may supply extra fields (e.g. cache statistics) to
+    merge into the /health response.
     """
 
+    # The card never changes for the lifetime of the process, so serialize it
+    # once here instead of walking the model on every discovery request.
+    card_bytes = orjson.dumps(agent_card.model_dump(mode="json"))
+    card_etag = f'"{hashlib.blake2s(card_bytes).hexdigest()}"'
+    card_headers = {"cache-control": "public, max-age=3600", "etag": card_etag}
+    health_response = ORJSONResponse({"status": "ok"})
+
     @app.get("/.well-known/agent-card.json")
-    async def get_agent_card():
-        return agent_card.model_dump()
+    async def get_agent_card(request: Request):
+        if_none_match = request.headers.get("if-none-match", "")
+        if if_none_match.strip() == "*" or card_etag in (
+            tag.strip() for tag in if_none_match.split(",")
+        ):
+            return Response(status_code=304, headers=card_headers)
+        return Response(
+            content=card_bytes, media_type="application/json", headers=card_headers
+        )
 
-    @app.post("/rpc")
-    async def rpc_gateway(request: RPCRequest):
+    async def dispatch(request: RPCRequest) -> Dict[str, Any]:
+        """Run one non-streaming JSON-RPC call and build its response envelope."""
         params = request.params or {}
 
         if request.method == "message/send":
             result = await handler.on_message_send(
-                MessageSendParams(**params)
+                _MESSAGE_SEND_PARAMS.validate_python(params)
             )
 
-        elif request.method == "message/send_stream":
-            send_params = MessageSendParams(**params)
-
-            async def stream():
-                async for event in handler.on_message_send_stream(send_params):
-                    yield json.dumps(event.model_dump()) + "\n"
-
-            return StreamingResponse(stream(), media_type="application/json")
-
         elif request.method == "task/get":
-            result = await handler.on_get_task(TaskQueryParams(**params))
+            result = await handler.on_get_task(_TASK_QUERY_PARAMS.validate_python(params))
             if result is None:
                 raise HTTPException(status_code=404, detail="Task not found")
 
         elif request.method == "task/cancel":
-            result = await handler.on_cancel_task(TaskIdParams(**params))
+            result = await handler.on_cancel_task(_TASK_ID_PARAMS.validate_python(params))
             if result is None:
                 raise HTTPException(status_code=404, detail="Task not found")
 
@@ -241,6 +303,63 @@ def register_agent_routes(
 
         return {"jsonrpc": "2.0", "id": request.id, "result": result.model_dump()}
 
+    def rpc_error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    async def dispatch_batch_item(item: Any) -> Dict[str, Any]:
+        """
+        Validate and run one batch entry, reporting failures as JSON-RPC
+        error objects so a bad entry never fails its siblings.
+        """
+        try:
+            request = _RPC_REQUEST.validate_python(item)
+        except ValidationError:
+            request_id = item.get("id") if isinstance(item, dict) else None
+            if not isinstance(request_id, (str, int)):
+                request_id = None
+            return rpc_error(request_id, -32600, "Invalid Request")
+
+        try:
+            if request.method == "message/send_stream":
+                raise HTTPException(status_code=400, detail="Streaming is not supported in batches")
+            return await dispatch(request)
+        except HTTPException as exc:
+            code = -32601 if exc.detail == "Unknown method" else -32000
+            return rpc_error(request.id, code, exc.detail)
+        except ValidationError as exc:
+            return rpc_error(request.id, -32602, str(exc))
+        except Exception:
+            # keep the rest of the batch; sibling calls may already have
+            # stored tasks whose results the client still needs
+            return rpc_error(request.id, -32603, "Internal error")
+
+    @app.post("/rpc")
+    async def rpc_gateway(request: Union[RPCRequest, List[Any]]):
+        # JSON-RPC batch: an array of calls answered by an array of results.
+        # Entries stay unvalidated here so each one is checked on its own.
+        if isinstance(request, list):
+            if not request:
+                return ORJSONResponse(rpc_error(None, -32600, "Invalid Request"))
+            responses = await asyncio.gather(
+                *(dispatch_batch_item(item) for item in request)
+            )
+            return ORJSONResponse(list(responses))
+
+        if request.method == "message/send_stream":
+            send_params = _MESSAGE_SEND_PARAMS.validate_python(request.params or {})
+
+            async def stream():
+                # bytes pass through Starlette without another encode step;
+                # None fields are dropped to keep each event line small
+                async for event in handler.on_message_send_stream(send_params):
+                    yield orjson.dumps(event.model_dump(mode="json", exclude_none=True)) + b"\n"
+
+            return StreamingResponse(stream(), media_type="application/json")
+
+        return ORJSONResponse(await dispatch(request))
+
     @app.get("/health")
     async def health_check():
-        return {"status": "ok"}
+        if health_details is not None:
+            return {"status": "ok", **health_details()}
+        return health_response
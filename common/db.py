@@ -8,11 +8,21 @@ CRUD operations required by the MCP server and the A2A agents.
 
 from __future__ import annotations
 
+import asyncio
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set
 
 import aiosqlite
+from cachetools import TTLCache
+
+from common.sql import (
+    CONNECTION_PRAGMAS,
+    INSERT_CHUNK_SIZE,
+    flatten_params,
+    iter_insert_batches,
+    multi_insert_sql,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -21,6 +31,15 @@ import aiosqlite
 
 DB_PATH = Path(os.getenv("A2A_DB_PATH", "./triage.db"))
 
+# sqlite3 keeps this many prepared statements per connection keyed by SQL
+# text, so repeated queries skip parsing and planning.
+STATEMENT_CACHE_SIZE = 256
+
+# In-process read caches; writes through this module invalidate them.
+PATIENT_CACHE_TTL = float(os.getenv("A2A_PATIENT_CACHE_TTL", 30))
+ENCOUNTER_CACHE_TTL = float(os.getenv("A2A_ENCOUNTER_CACHE_TTL", 5))
+READ_CACHE_SIZE = int(os.getenv("A2A_READ_CACHE_SIZE", 512))
+
 _SCHEMA_SQL = """
 CREATE TABLE IF NOT EXISTS patients (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -48,6 +67,10 @@ CREATE TABLE IF NOT EXISTS encounters (
     created_at TEXT DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY(patient_id) REFERENCES patients(id)
 );
+
+CREATE INDEX IF NOT EXISTS idx_enc_pat_created ON encounters(patient_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_pat_status ON patients(status);
+CREATE INDEX IF NOT EXISTS idx_cases_patient ON cases(patient_id, created_at DESC);
 """
 
 _SEED_PATIENTS = [
@@ -64,40 +87,284 @@ _SEED_ENCOUNTERS = [
 ]
 
 
+# ---------------------------------------------------------------------------
+# SQL statements
+# ---------------------------------------------------------------------------
+
+# Built once so every call hands sqlite3 the same string object, which keeps
+# the per-connection statement cache lookup cheap. ``{}`` slots take a
+# placeholder list or assignment list that varies per call.
+_SQL_COUNT_PATIENTS = "SELECT COUNT(*) FROM patients"
+
+_SQL_LOAD_PATIENTS = (
+    "SELECT id, name, date_of_birth, status, created_at "
+    "FROM patients WHERE id IN ({})"
+)
+
+_SQL_LIST_PATIENTS_ALL = (
+    "SELECT id, name, date_of_birth, status, created_at "
+    "FROM patients LIMIT ?"
+)
+
+_SQL_LIST_PATIENTS_STATUS = (
+    "SELECT id, name, date_of_birth, status, created_at "
+    "FROM patients WHERE status = ? LIMIT ?"
+)
+
+_SQL_UPDATE_PATIENT = (
+    "UPDATE patients SET {} WHERE id = ? "
+    "RETURNING id, name, date_of_birth, status, created_at"
+)
+
+_SQL_CREATE_CASE = (
+    "INSERT INTO cases (patient_id, complaint, urgency, status) "
+    "VALUES (?, ?, ?, 'open') "
+    "RETURNING id, patient_id, complaint, urgency, status, created_at"
+)
+
+_SQL_LOAD_ENCOUNTERS = (
+    "SELECT patient_id, id, channel, notes, created_at "
+    "FROM encounters WHERE patient_id IN ({}) "
+    "ORDER BY patient_id, created_at DESC"
+)
+
+_SQL_ADD_ENCOUNTER = (
+    "INSERT INTO encounters (patient_id, channel, notes) VALUES (?, ?, ?) "
+    "RETURNING id, channel, notes, created_at"
+)
+
+
 # ---------------------------------------------------------------------------
 # Initialization helpers
 # ---------------------------------------------------------------------------
 
+async def bulk_insert(
+    db: aiosqlite.Connection,
+    table: str,
+    cols: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    chunk: int = INSERT_CHUNK_SIZE,
+) -> None:
+    """
+    Insert ``rows`` using multi-row ``INSERT ... VALUES (...), (...)``
+    statements of up to ``chunk`` rows each (fewer for very wide tables). The caller commits, so several
+    bulk inserts can share one transaction. ``table`` and ``cols`` are
+    interpolated into the SQL and must be trusted identifiers.
+    """
+    for batch in iter_insert_batches(rows, cols, chunk):
+        await db.execute(multi_insert_sql(table, cols, len(batch)), flatten_params(batch))
+
+
+# Paths whose schema/seed step already ran in this process.
+_initialized_paths: set[Path] = set()
+_init_lock = asyncio.Lock()
+
+
 async def initialize_database(db_path: Path = DB_PATH) -> None:
     """
     Create schema if needed and populate sample rows when database is empty.
+    Runs at most once per database path per process; later calls return
+    immediately.
     """
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-
-    async with aiosqlite.connect(db_path) as db:
-        await db.executescript(_SCHEMA_SQL)
-        await db.commit()
-
-        # Only insert seed data on first run
-        row_count = await db.execute_fetchone("SELECT COUNT(*) FROM patients")
-        if row_count and row_count[0] == 0:
-            await db.executemany(
-                "INSERT INTO patients(name, date_of_birth, status) VALUES (?, ?, ?)",
-                _SEED_PATIENTS,
-            )
-            await db.executemany(
-                "INSERT INTO encounters(patient_id, channel, notes) VALUES (?, ?, ?)",
-                _SEED_ENCOUNTERS,
-            )
+    if db_path in _initialized_paths:
+        return
+
+    async with _init_lock:
+        if db_path in _initialized_paths:
+            return
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        async with aiosqlite.connect(db_path) as db:
+            # Ignored once the file exists; new databases get larger pages.
+            await db.execute("PRAGMA page_size = 8192")
+            await db.executescript(_SCHEMA_SQL)
             await db.commit()
 
+            # Only insert seed data on first run
+            row_count = await _fetchone(db, _SQL_COUNT_PATIENTS)
+            if row_count and row_count[0] == 0:
+                await bulk_insert(
+                    db, "patients", ("name", "date_of_birth", "status"), _SEED_PATIENTS
+                )
+                await bulk_insert(
+                    db, "encounters", ("patient_id", "channel", "notes"), _SEED_ENCOUNTERS
+                )
+                await db.commit()
+
+        _initialized_paths.add(db_path)
+
 
 async def open_connection(db_path: Path = DB_PATH) -> aiosqlite.Connection:
     """
     Ensure the DB is initialized, then return a new connection.
     """
     await initialize_database(db_path)
-    return await aiosqlite.connect(db_path)
+    return await aiosqlite.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE)
+
+
+# ---------------------------------------------------------------------------
+# Shared connection
+# ---------------------------------------------------------------------------
+
+_conn: Optional[aiosqlite.Connection] = None
+_conn_lock = asyncio.Lock()
+
+# Serializes writes on the shared connection so a rollback cannot discard
+# another coroutine's uncommitted statement.
+_write_lock = asyncio.Lock()
+
+
+async def _get_conn() -> aiosqlite.Connection:
+    """
+    Return the process-wide connection, opening and tuning it on first use.
+    Reusing one connection keeps SQLite's page cache warm and avoids a new
+    file handle and worker thread per query.
+    """
+    global _conn
+    if _conn is not None:
+        return _conn
+
+    async with _conn_lock:
+        if _conn is None:
+            await initialize_database(DB_PATH)
+            conn = await aiosqlite.connect(DB_PATH, cached_statements=STATEMENT_CACHE_SIZE)
+            conn.row_factory = aiosqlite.Row
+            for pragma in CONNECTION_PRAGMAS:
+                await conn.execute(pragma)
+            _conn = conn
+    return _conn
+
+
+async def close_connection() -> None:
+    """
+    Close the shared connection; call from the application's shutdown hook.
+    """
+    global _conn
+    async with _conn_lock:
+        if _conn is not None:
+            await _conn.close()
+            _conn = None
+
+
+async def _fetchone(db: aiosqlite.Connection, sql: str, params: Sequence[Any] = ()):
+    async with db.execute(sql, params) as cursor:
+        return await cursor.fetchone()
+
+
+async def _write(sql: str, params: Sequence[Any]):
+    """
+    Run one write statement on the shared connection and commit it, returning
+    its first row. On failure the transaction is rolled back so the
+    connection never keeps holding SQLite's write lock.
+    """
+    db = await _get_conn()
+    async with _write_lock:
+        try:
+            row = await _fetchone(db, sql, params)
+            await db.commit()
+        except BaseException:
+            await db.rollback()
+            raise
+    return row
+
+
+# ---------------------------------------------------------------------------
+# Request coalescing
+# ---------------------------------------------------------------------------
+
+class BatchLoader:
+    """
+    Coalesce concurrent single-key lookups into one batched query (the
+    DataLoader pattern). Keys requested within ``delay`` seconds of each
+    other, or until ``max_batch`` distinct keys are pending, are resolved by
+    a single ``await batch_fn(keys)`` returning ``{key: value}``; keys absent
+    from that mapping resolve to None.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Awaitable[Dict[Any, Any]]],
+        *,
+        max_batch: int = 32,
+        delay: float = 0.001,
+    ) -> None:
+        self._batch_fn = batch_fn
+        self._max_batch = max_batch
+        self._delay = delay
+        self._pending: Dict[Any, List[asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+
+    async def load(self, key: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+
+        if len(self._pending) >= self._max_batch:
+            self._dispatch()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._delay, self._dispatch)
+
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: Dict[Any, List[asyncio.Future]]) -> None:
+        try:
+            results = await self._batch_fn(list(batch))
+        except Exception as exc:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        for key, futures in batch.items():
+            value = results.get(key)
+            for future in futures:
+                if not future.done():
+                    future.set_result(value)
+
+
+def _placeholders(count: int) -> str:
+    return ", ".join("?" * count)
+
+
+async def _load_patients(patient_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    db = await _get_conn()
+    rows = await db.execute_fetchall(
+        _SQL_LOAD_PATIENTS.format(_placeholders(len(patient_ids))), patient_ids
+    )
+    return {row["id"]: dict(row) for row in rows}
+
+
+async def _load_encounters(patient_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    db = await _get_conn()
+    rows = await db.execute_fetchall(
+        _SQL_LOAD_ENCOUNTERS.format(_placeholders(len(patient_ids))), patient_ids
+    )
+    grouped: Dict[int, List[Dict[str, Any]]] = {pid: [] for pid in patient_ids}
+    for row in rows:
+        record = dict(row)
+        grouped[record.pop("patient_id")].append(record)
+    return grouped
+
+
+_patient_loader = BatchLoader(_load_patients)
+_encounter_loader = BatchLoader(_load_encounters)
+
+_patient_cache: TTLCache = TTLCache(maxsize=READ_CACHE_SIZE, ttl=PATIENT_CACHE_TTL)
+_encounter_cache: TTLCache = TTLCache(maxsize=READ_CACHE_SIZE, ttl=ENCOUNTER_CACHE_TTL)
 
 
 # ---------------------------------------------------------------------------
@@ -106,51 +373,27 @@ async def open_connection(db_path: Path = DB_PATH) -> aiosqlite.Connection:
 
 async def get_patient(patient_id: int) -> Optional[Dict[str, Any]]:
     """
-    Retrieve a single patient by ID.
+    Retrieve a single patient by ID. Results are cached briefly and
+    concurrent misses are batched into one query.
     """
-    async with await open_connection() as db:
-        row = await db.execute_fetchone(
-            "SELECT id, name, date_of_birth, status, created_at FROM patients WHERE id = ?",
-            (patient_id,),
-        )
-        if not row:
-            return None
-        return {
-            "id": row[0],
-            "name": row[1],
-            "date_of_birth": row[2],
-            "status": row[3],
-            "created_at": row[4],
-        }
+    patient = _patient_cache.get(patient_id)
+    if patient is None:
+        patient = await _patient_loader.load(patient_id)
+        if patient is not None:
+            _patient_cache[patient_id] = patient
+    return patient
 
 
 async def list_patients(status: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
     """
     Retrieve multiple patients, optionally filtered by status.
     """
-    async with await open_connection() as db:
-        if status:
-            rows = await db.execute_fetchall(
-                "SELECT id, name, date_of_birth, status, created_at "
-                "FROM patients WHERE status = ? LIMIT ?",
-                (status, limit),
-            )
-        else:
-            rows = await db.execute_fetchall(
-                "SELECT id, name, date_of_birth, status, created_at "
-                "FROM patients LIMIT ?",
-                (limit,),
-            )
-        return [
-            {
-                "id": r[0],
-                "name": r[1],
-                "date_of_birth": r[2],
-                "status": r[3],
-                "created_at": r[4],
-            }
-            for r in rows
-        ]
+    db = await _get_conn()
+    if status:
+        rows = await db.execute_fetchall(_SQL_LIST_PATIENTS_STATUS, (status, limit))
+    else:
+        rows = await db.execute_fetchall(_SQL_LIST_PATIENTS_ALL, (limit,))
+    return [dict(r) for r in rows]
 
 
 async def update_patient(patient_id: int, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -160,96 +403,47 @@ async def update_patient(patient_id: int, changes: Dict[str, Any]) -> Optional[D
     allowed = {"name", "date_of_birth", "status"}
     clean_updates = {k: v for k, v in changes.items() if k in allowed}
 
-    existing = await get_patient(patient_id)
-    if not existing:
-        return None
     if not clean_updates:
-        return existing
+        return await get_patient(patient_id)
+
+    assignments = ", ".join(f"{col} = ?" for col in clean_updates)
+    values = [*clean_updates.values(), patient_id]
 
-    async with await open_connection() as db:
-        for col, value in clean_updates.items():
-            await db.execute(
-                f"UPDATE patients SET {col} = ? WHERE id = ?",
-                (value, patient_id),
-            )
-        await db.commit()
+    # RETURNING yields the updated row, or nothing if the patient is missing
+    row = await _write(_SQL_UPDATE_PATIENT.format(assignments), values)
+    _patient_cache.pop(patient_id, None)
 
-    return await get_patient(patient_id)
+    return dict(row) if row else None
 
 
 async def create_case(patient_id: int, complaint: str, urgency: str) -> Dict[str, Any]:
     """
     Insert a new case and return the resulting row.
     """
-    async with await open_connection() as db:
-        cursor = await db.execute(
-            "INSERT INTO cases (patient_id, complaint, urgency, status) "
-            "VALUES (?, ?, ?, 'open')",
-            (patient_id, complaint, urgency),
-        )
-        await db.commit()
-        case_id = cursor.lastrowid
-
-        row = await db.execute_fetchone(
-            "SELECT id, patient_id, complaint, urgency, status, created_at "
-            "FROM cases WHERE id = ?",
-            (case_id,),
-        )
-        return {
-            "id": row[0],
-            "patient_id": row[1],
-            "complaint": row[2],
-            "urgency": row[3],
-            "status": row[4],
-            "created_at": row[5],
-        }
+    row = await _write(_SQL_CREATE_CASE, (patient_id, complaint, urgency))
+    return dict(row)
 
 
 async def list_encounters(patient_id: int) -> List[Dict[str, Any]]:
     """
-    Return encounter history newest → oldest.
+    Return encounter history newest → oldest. Results are cached briefly and
+    concurrent misses are batched into one query.
     """
-    async with await open_connection() as db:
-        rows = await db.execute_fetchall(
-            "SELECT id, channel, notes, created_at "
-            "FROM encounters WHERE patient_id = ? ORDER BY created_at DESC",
-            (patient_id,),
-        )
-        return [
-            {
-                "id": r[0],
-                "channel": r[1],
-                "notes": r[2],
-                "created_at": r[3],
-            }
-            for r in rows
-        ]
+    encounters = _encounter_cache.get(patient_id)
+    if encounters is None:
+        encounters = await _encounter_loader.load(patient_id)
+        _encounter_cache[patient_id] = encounters
+    return encounters
 
 
 async def add_encounter(patient_id: int, notes: str, channel: str = "agent") -> Dict[str, Any]:
     """
     Insert a new encounter entry and return it.
     """
-    async with await open_connection() as db:
-        cursor = await db.execute(
-            "INSERT INTO encounters (patient_id, channel, notes) VALUES (?, ?, ?)",
-            (patient_id, channel, notes),
-        )
-        await db.commit()
-        new_id = cursor.lastrowid
-
-        row = await db.execute_fetchone(
-            "SELECT id, channel, notes, created_at "
-            "FROM encounters WHERE id = ?",
-            (new_id,),
-        )
-
-        return {
-            "id": row[0],
-            "channel": row[1],
-            "notes": row[2],
-            "created_at": row[3],
-        }
+    row = await _write(_SQL_ADD_ENCOUNTER, (patient_id, channel, notes))
+    _encounter_cache.pop(patient_id, None)
+
+    return dict(row)
 
 
 # ---------------------------------------------------------------------------
@@ -258,7 +452,10 @@ async def add_encounter(patient_id: int, notes: str, channel: str = "agent") ->
 
 __all__ = [
     "initialize_database",
+    "bulk_insert",
     "open_connection",
+    "close_connection",
+    "BatchLoader",
     "get_patient",
     "list_patients",
     "update_patient",
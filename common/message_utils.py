@@ -7,12 +7,35 @@ helpers to produce consistent message structures for JSON-RPC responses.
 
 from __future__ import annotations
 
-import uuid
+import os
+import random
 from typing import Optional
 
 from sdk.types import Message, Role, TextPart
 
 
+# Internal message and JSON-RPC correlation ids only need to be unique, so
+# they are drawn from a PRNG seeded once from the OS instead of hitting
+# urandom each time.  The output is predictable after enough samples, so never
+# use new_id() for anything that acts as a credential (task or context ids).
+# The generator is reseeded in forked children so workers never share a
+# sequence.
+_rng = random.Random(os.urandom(16))
+
+
+def _reseed() -> None:
+    _rng.seed(os.urandom(16))
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed)
+
+
+def new_id() -> str:
+    """Return a fast, non-cryptographic 128-bit identifier as 32 hex characters."""
+    return f"{_rng.getrandbits(128):032x}"
+
+
 def create_text_message(
     text: str,
     *,
@@ -36,7 +59,7 @@ def create_text_message(
     part = TextPart(text=text)
 
     return Message(
-        messageId=uuid.uuid4().hex,
+        messageId=new_id(),
         role=role,
         parts=[part],
         taskId=task_id,
@@ -0,0 +1,72 @@
+"""
+SQL Helpers
+-----------
+Driver-independent SQL builders shared by the async data layer
+(:mod:`common.db`) and the synchronous setup script (``database_setup.py``).
+"""
+
+from __future__ import annotations
+
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Sequence
+
+
+# Default rows per multi-row INSERT; iter_insert_batches lowers it for wide
+# tables so a statement never exceeds SQLITE_MAX_VARIABLE_NUMBER.
+INSERT_CHUNK_SIZE = 1000
+SQLITE_MAX_VARIABLES = 32766
+
+# Tuning for long-lived connections, applied once when one is opened. mmap
+# reads skip a read() syscall per page, the nearest stand-in for io_uring that
+# Python's sqlite3 offers.
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA wal_autocheckpoint = 1000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 1073741824",
+    "PRAGMA cache_size = -64000",
+)
+
+
+def multi_insert_sql(table: str, cols: Sequence[str], row_count: int) -> str:
+    """
+    Return ``INSERT INTO table(cols) VALUES (?, ...), (?, ...)`` with
+    ``row_count`` row tuples. ``table`` and ``cols`` are interpolated and must
+    be trusted identifiers.
+    """
+    placeholder = "(" + ", ".join("?" * len(cols)) + ")"
+    values = ", ".join([placeholder] * row_count)
+    return f"INSERT INTO {table}({', '.join(cols)}) VALUES {values}"
+
+
+def iter_insert_batches(
+    rows: Iterable[Sequence[Any]],
+    cols: Sequence[str],
+    chunk: int = INSERT_CHUNK_SIZE,
+) -> Iterator[List[Sequence[Any]]]:
+    """
+    Yield ``rows`` in lists of up to ``chunk`` rows without materializing the
+    whole iterable. The batch size is capped so one INSERT binds at most
+    ``SQLITE_MAX_VARIABLES`` parameters for ``len(cols)`` columns.
+    """
+    chunk = max(1, min(chunk, SQLITE_MAX_VARIABLES // max(1, len(cols))))
+    row_iter = iter(rows)
+    while batch := list(islice(row_iter, chunk)):
+        yield batch
+
+
+def flatten_params(batch: Sequence[Sequence[Any]]) -> List[Any]:
+    """Flatten row tuples into the positional parameter list for one INSERT."""
+    return [value for row in batch for value in row]
+
+
+__all__ = [
+    "CONNECTION_PRAGMAS",
+    "INSERT_CHUNK_SIZE",
+    "SQLITE_MAX_VARIABLES",
+    "multi_insert_sql",
+    "iter_insert_batches",
+    "flatten_params",
+]
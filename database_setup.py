@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import sqlite3
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Iterable, Sequence, Tuple
+
+from common.sql import flatten_params, iter_insert_batches, multi_insert_sql
 
 
 class DatabaseSetup:
@@ -15,7 +17,14 @@ class DatabaseSetup:
         """Create tables and seed sample data if empty."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         with sqlite3.connect(self.db_path) as conn:
+            # page_size only takes effect on a brand-new file, so it must run
+            # before journal_mode or any CREATE TABLE writes the header.
+            conn.execute("PRAGMA page_size = 8192")
             conn.execute("PRAGMA foreign_keys = ON")
+            # WAL lets readers proceed while a writer commits; it is stored in
+            # the database file, so every later connection inherits it.
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
             conn.executescript(
                 """
                 CREATE TABLE IF NOT EXISTS patients (
@@ -44,6 +53,10 @@ class DatabaseSetup:
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY(patient_id) REFERENCES patients(id)
                 );
+
+                CREATE INDEX IF NOT EXISTS idx_enc_pat_created ON encounters(patient_id, created_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_pat_status ON patients(status);
+                CREATE INDEX IF NOT EXISTS idx_cases_patient ON cases(patient_id, created_at DESC);
                 """
             )
             conn.commit()
@@ -62,15 +75,37 @@ class DatabaseSetup:
                     (2, "phone", "Medication refill request"),
                     (3, "email", "Reported chest tightness after exercise"),
                 ]
-                conn.executemany(
-                    "INSERT INTO patients(name, date_of_birth, status) VALUES(?,?,?)",
-                    patients,
-                )
-                conn.executemany(
-                    "INSERT INTO encounters(patient_id, channel, notes) VALUES(?,?,?)",
-                    encounters,
-                )
-                conn.commit()
+                # Skip fsyncs for the one seed commit. The WAL journal stays,
+                # so a crash of this process leaves the file consistent (the
+                # seed simply reruns next time); only an OS crash or power loss
+                # during the load could damage it.
+                conn.execute("PRAGMA synchronous = OFF")
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        self._insert_rows(
+                            conn, "patients", ("name", "date_of_birth", "status"), patients
+                        )
+                        self._insert_rows(
+                            conn, "encounters", ("patient_id", "channel", "notes"), encounters
+                        )
+                    except BaseException:
+                        conn.execute("ROLLBACK")
+                        raise
+                    conn.execute("COMMIT")
+                finally:
+                    conn.execute("PRAGMA synchronous = NORMAL")
+
+    @staticmethod
+    def _insert_rows(
+        conn: sqlite3.Connection,
+        table: str,
+        cols: Sequence[str],
+        rows: Iterable[Sequence[object]],
+    ) -> None:
+        """Insert rows with multi-row VALUES statements, one chunk at a time."""
+        for batch in iter_insert_batches(rows, cols):
+            conn.execute(multi_insert_sql(table, cols, len(batch)), flatten_params(batch))
 
 
 if __name__ == "__main__":
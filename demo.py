@@ -3,18 +3,21 @@ import os
 
 import httpx
 
-from sdk.types import Message, MessageSendParams, Role
-from shared.message_utils import build_text_message
+from sdk.types import Message, MessageSendParams, Role, TextPart
+from shared.message_utils import new_id
 
 ROUTER_RPC = os.getenv("ROUTER_RPC", "http://localhost:8010/rpc")
 
+# Validated once; each request only swaps in its prompt text and message id.
+_PARAMS_TEMPLATE = MessageSendParams(
+    message=Message(messageId="", role=Role.user, parts=[TextPart(text="")])
+).model_dump()
+
 
 def build_request(prompt: str) -> dict:
-    base_message = build_text_message(prompt, role=Role.user)
-    params = MessageSendParams(
-        message=Message(messageId=base_message.messageId, role=Role.user, parts=base_message.parts)
-    )
-    return {"jsonrpc": "2.0", "id": "demo", "method": "message/send", "params": params.model_dump()}
+    message = {**_PARAMS_TEMPLATE["message"], "messageId": new_id(), "parts": [{"text": prompt}]}
+    params = {**_PARAMS_TEMPLATE, "message": message}
+    return {"jsonrpc": "2.0", "id": "demo", "method": "message/send", "params": params}
 
 
 def print_response(prompt: str, result: dict | None) -> None:
@@ -35,13 +38,19 @@ async def main():
         "List recent urgent patients and suggest a follow-up action",
     ]
 
-    async with httpx.AsyncClient() as client:
-        for prompt in prompts:
-            request_body = build_request(prompt)
-            response = await client.post(ROUTER_RPC, json=request_body)
-            response.raise_for_status()
-            result = response.json().get("result")
-            print_response(prompt, result)
+    # send every prompt at once; total wait is the slowest reply, not the sum
+    async with httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=10),
+        timeout=httpx.Timeout(30.0),
+    ) as client:
+        responses = await asyncio.gather(
+            *(client.post(ROUTER_RPC, json=build_request(prompt)) for prompt in prompts)
+        )
+
+    for prompt, response in zip(prompts, responses):
+        response.raise_for_status()
+        print_response(prompt, response.json().get("result"))
 
 
 if __name__ == "__main__":
@@ -4,14 +4,18 @@
 # ============================================================================
 
 import asyncio
-from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
 
+import orjson
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from sse_starlette.sse import EventSourceResponse
 
 # database access layer (unchanged API)
 from mcp_server.database import (
+    close_database,
     fetch_patient,
     fetch_patients,
     update_patient_record,
@@ -23,13 +27,26 @@ from mcp_server.database import (
 #  Application Setup
 # ----------------------------------------------------------------------------
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    try:
+        yield
+    finally:
+        await close_database()
+
+
 app = FastAPI(
     title="Healthcare Triage MCP Server",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# A central queue for SSE events (audit logs, updates, etc.)
-event_queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue()
+# One bounded queue per connected SSE client for events (audit logs, updates,
+# etc.). A slow client loses its oldest events instead of growing memory, and
+# nothing is buffered while no client is listening.
+EVENT_QUEUE_SIZE = 1024
+event_subscribers: Set[asyncio.Queue[Dict[str, Any]]] = set()
 
 
 # ----------------------------------------------------------------------------
@@ -110,17 +127,107 @@ TOOL_REGISTRY: List[Dict[str, Any]] = [
 #  Utility Helpers
 # ----------------------------------------------------------------------------
 
-async def enqueue_event(payload: Dict[str, Any]) -> None:
+def enqueue_event(payload: Dict[str, Any]) -> None:
     """
-    Add an event to the SSE queue for asynchronous streaming.
+    Add an event to every SSE client's queue without blocking.
     """
-    await event_queue.put(payload)
+    for queue in event_subscribers:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(payload)
 
 
 def http_not_found(message: str):
     raise HTTPException(status_code=404, detail=message)
 
 
+# ----------------------------------------------------------------------------
+#  Tool Handlers
+# ----------------------------------------------------------------------------
+
+async def _handle_get_patient(args: Dict[str, Any]) -> Dict[str, Any]:
+    patient_id = int(args.get("patient_id"))
+    patient = await fetch_patient(patient_id)
+
+    if not patient:
+        http_not_found("Patient does not exist")
+
+    enqueue_event({
+        "type": "audit",
+        "tool": "get_patient",
+        "patient_id": patient["id"]
+    })
+    return patient
+
+
+async def _handle_list_patients(args: Dict[str, Any]) -> List[Dict[str, Any]]:
+    status = args.get("status")
+    limit = int(args.get("limit", 20))
+
+    records = await fetch_patients(status, limit)
+
+    enqueue_event({
+        "type": "audit",
+        "tool": "list_patients",
+        "count": len(records)
+    })
+    return records
+
+
+async def _handle_update_patient(args: Dict[str, Any]) -> Dict[str, Any]:
+    pid = int(args.get("patient_id"))
+    patch = args.get("data") or {}
+
+    updated = await update_patient_record(pid, patch)
+
+    if not updated:
+        http_not_found("Patient not found for update")
+
+    enqueue_event({
+        "type": "update",
+        "tool": "update_patient",
+        "patient_id": updated["id"]
+    })
+    return updated
+
+
+async def _handle_create_case(args: Dict[str, Any]) -> Dict[str, Any]:
+    pid = int(args.get("patient_id"))
+    complaint = str(args.get("complaint"))
+    urgency = str(args.get("urgency"))
+
+    case = await create_case_record(pid, complaint, urgency)
+
+    enqueue_event({
+        "type": "case",
+        "tool": "create_case",
+        "case_id": case["id"]
+    })
+    return case
+
+
+async def _handle_get_patient_history(args: Dict[str, Any]) -> List[Dict[str, Any]]:
+    pid = int(args.get("patient_id"))
+    history = await fetch_history(pid)
+
+    enqueue_event({
+        "type": "history",
+        "tool": "get_patient_history",
+        "count": len(history)
+    })
+    return history
+
+
+# Tool name -> handler; one dict lookup replaces a chain of name comparisons.
+TOOL_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {
+    "get_patient": _handle_get_patient,
+    "list_patients": _handle_list_patients,
+    "update_patient": _handle_update_patient,
+    "create_case": _handle_create_case,
+    "get_patient_history": _handle_get_patient_history,
+}
+
+
 # ----------------------------------------------------------------------------
 #  Routes
 # ----------------------------------------------------------------------------
@@ -134,89 +241,15 @@ async def list_tools() -> Dict[str, Any]:
 
 
 @app.post("/tools/call")
-async def call_tool(request: ToolInvocation) -> Dict[str, Any]:
+async def call_tool(request: ToolInvocation) -> ORJSONResponse:
     """
     Execute a specific tool by name.
     """
+    handler = TOOL_HANDLERS.get(request.name)
+    if handler is None:
+        http_not_found(f"Unknown tool: {request.name}")
 
-    tool = request.name
-    args = request.arguments
-
-    # --- get_patient ---------------------------------------------------------
-    if tool == "get_patient":
-        patient_id = int(args.get("patient_id"))
-        patient = await asyncio.to_thread(fetch_patient, patient_id)
-
-        if not patient:
-            http_not_found("Patient does not exist")
-
-        await enqueue_event({
-            "type": "audit",
-            "tool": tool,
-            "patient_id": patient["id"]
-        })
-        return {"result": patient}
-
-    # --- list_patients -------------------------------------------------------
-    if tool == "list_patients":
-        status = args.get("status")
-        limit = int(args.get("limit", 20))
-
-        records = await asyncio.to_thread(fetch_patients, status, limit)
-
-        await enqueue_event({
-            "type": "audit",
-            "tool": tool,
-            "count": len(records)
-        })
-        return {"result": records}
-
-    # --- update_patient ------------------------------------------------------
-    if tool == "update_patient":
-        pid = int(args.get("patient_id"))
-        patch = args.get("data") or {}
-
-        updated = await asyncio.to_thread(update_patient_record, pid, patch)
-
-        if not updated:
-            http_not_found("Patient not found for update")
-
-        await enqueue_event({
-            "type": "update",
-            "tool": tool,
-            "patient_id": updated["id"]
-        })
-        return {"result": updated}
-
-    # --- create_case --------------------------------------------------------
-    if tool == "create_case":
-        pid = int(args.get("patient_id"))
-        complaint = str(args.get("complaint"))
-        urgency = str(args.get("urgency"))
-
-        case = await asyncio.to_thread(create_case_record, pid, complaint, urgency)
-
-        await enqueue_event({
-            "type": "case",
-            "tool": tool,
-            "case_id": case["id"]
-        })
-        return {"result": case}
-
-    # --- get_patient_history -------------------------------------------------
-    if tool == "get_patient_history":
-        pid = int(args.get("patient_id"))
-        history = await asyncio.to_thread(fetch_history, pid)
-
-        await enqueue_event({
-            "type": "history",
-            "tool": tool,
-            "count": len(history)
-        })
-        return {"result": history}
-
-    # unknown tool
-    http_not_found(f"Unknown tool: {tool}")
+    return ORJSONResponse({"result": await handler(request.arguments)})
 
 
 @app.get("/events/stream")
@@ -226,9 +259,15 @@ async def stream_events():
     """
 
     async def generator():
-        while True:
-            event = await event_queue.get()
-            yield {"event": "update", "data": event}
+        queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        event_subscribers.add(queue)
+        try:
+            while True:
+                event = await queue.get()
+                # sse_starlette would str() a dict; send real JSON instead
+                yield {"event": "update", "data": orjson.dumps(event).decode()}
+        finally:
+            event_subscribers.discard(queue)
 
     return EventSourceResponse(generator())
 
@@ -251,5 +290,8 @@ if __name__ == "__main__":
     uvicorn.run(
         app,
         host="0.0.0.0",
-        port=8000
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
     )
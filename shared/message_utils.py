@@ -6,7 +6,7 @@ the implementation now resides in :mod:`common.message_utils`.  This module
 bridges the gap without duplicating logic.
 """
 
-from common.message_utils import create_text_message
+from common.message_utils import create_text_message, new_id
 
 
 def build_text_message(*args, **kwargs):
@@ -14,4 +14,4 @@ def build_text_message(*args, **kwargs):
     return create_text_message(*args, **kwargs)
 
 
-__all__ = ["build_text_message", "create_text_message"]
+__all__ = ["build_text_message", "create_text_message", "new_id"]